@@ -1,45 +1,125 @@
-from typing import Optional, Any
-import redis
-import json
+from typing import Optional, Any, Dict, List
+import redis.asyncio as redis
+import orjson
 import os
+import zstandard as zstd
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
-redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+# Explicit pool so concurrent requests reuse warm, health-checked connections.
+# The blocking pool waits briefly for a free connection at the cap instead of
+# raising "Too many connections" (which would turn bursts into cache misses).
+# Values are orjson-encoded bytes, so skip decoding responses.
+redis_pool = redis.BlockingConnectionPool.from_url(
+    REDIS_URL,
+    max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "64")),
+    timeout=float(os.getenv("REDIS_POOL_TIMEOUT", "0.5")),
+    socket_keepalive=True,
+    health_check_interval=30,
+    decode_responses=False
+)
+redis_client = redis.Redis(connection_pool=redis_pool)
+
+# Large payloads (list pages) are zstd-compressed; level 1 costs less than the
+# bytes it saves on the wire and in Redis memory. Small values stay plain.
+COMPRESS_MIN_BYTES = 1024
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_cctx = zstd.ZstdCompressor(level=1)
+_dctx = zstd.ZstdDecompressor()
+
+def _pack(payload: bytes) -> bytes:
+    return _cctx.compress(payload) if len(payload) > COMPRESS_MIN_BYTES else payload
+
+def _unpack(value: bytes) -> bytes:
+    # JSON never starts with the zstd frame magic, so it doubles as the marker
+    return _dctx.decompress(value) if value.startswith(ZSTD_MAGIC) else value
 
 class CacheManager:
     def __init__(self, default_ttl: int = 300):
         self.default_ttl = default_ttl
         self.client = redis_client
     
-    def get(self, key: str) -> Optional[Any]:
+    def pipeline(self):
+        """Non-transactional pipeline for batching several commands into one round-trip"""
+        return self.client.pipeline(transaction=False)
+    
+    async def get_raw(self, key: str, refresh_ttl: Optional[int] = None) -> Optional[bytes]:
+        """
+        Return the stored JSON bytes without parsing them. With ``refresh_ttl``
+        the key's expiry is reset in the same round-trip (sliding TTL).
+        """
         try:
-            value = self.client.get(key)
+            if refresh_ttl:
+                value, _ = await self.pipeline().get(key).expire(key, refresh_ttl).execute()
+            else:
+                value = await self.client.get(key)
+            return _unpack(value) if value else None
+        except Exception:
+            return None
+    
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            value = await self.client.get(key)
             if value:
-                return json.loads(value)
+                return orjson.loads(_unpack(value))
             return None
         except Exception:
             return None
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         try:
             ttl = ttl or self.default_ttl
-            serialized_value = json.dumps(value, default=str)
-            return self.client.setex(key, ttl, serialized_value)
+            serialized_value = _pack(orjson.dumps(value))
+            return await self.client.setex(key, ttl, serialized_value)
         except Exception:
             return False
     
-    def delete(self, key: str) -> bool:
+    async def set_raw(self, key: str, payload: bytes, ttl: Optional[int] = None) -> bool:
+        """Store already-encoded JSON bytes"""
         try:
-            return bool(self.client.delete(key))
+            return await self.client.setex(key, ttl or self.default_ttl, _pack(payload))
         except Exception:
             return False
     
-    def clear_pattern(self, pattern: str) -> int:
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Fetch several keys in one round-trip; misses come back as None"""
         try:
-            keys = self.client.keys(pattern)
-            if keys:
-                return self.client.delete(*keys)
-            return 0
+            return [orjson.loads(_unpack(value)) if value else None for value in await self.client.mget(keys)]
+        except Exception:
+            return [None] * len(keys)
+    
+    async def mset(self, items: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Store several keys with the same TTL in one pipelined round-trip"""
+        try:
+            ttl = ttl or self.default_ttl
+            pipe = self.pipeline()
+            for key, value in items.items():
+                pipe.setex(key, ttl, _pack(orjson.dumps(value)))
+            await pipe.execute()
+            return True
+        except Exception:
+            return False
+    
+    async def delete(self, key: str) -> bool:
+        try:
+            return bool(await self.client.delete(key))
+        except Exception:
+            return False
+    
+    async def clear_pattern(self, pattern: str, batch_size: int = 1000) -> int:
+        """
+        Remove keys matching pattern without blocking Redis: SCAN walks the keyspace
+        incrementally and UNLINK reclaims memory in a background thread.
+        """
+        try:
+            pipe = self.pipeline()
+            count = 0
+            async for key in self.client.scan_iter(match=pattern, count=batch_size):
+                pipe.unlink(key)
+                count += 1
+                if count % batch_size == 0:
+                    await pipe.execute()
+            await pipe.execute()
+            return count
         except Exception:
             return 0
 
@@ -2,15 +2,172 @@
 CRUD operations for managing products, users and orders in the e-commerce system.
 Provides functions to retrieve and filter data from the database with pagination support.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import math
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, raiseload
+from sqlalchemy import and_, or_, func, literal, select, text, tuple_
+from sqlalchemy.sql import Select
 from models import Product, User, Order
+from schemas import PRODUCT_SORT_FIELDS, USER_SORT_FIELDS, ORDER_SORT_FIELDS
 
+# Columns served by the list endpoints; selected as plain rows, not ORM objects
+PRODUCT_LIST_COLUMNS = (
+    Product.id, Product.name, Product.price, Product.category, Product.brand,
+    Product.stock_quantity, Product.rating, Product.is_active,
+    Product.created_at, Product.updated_at
+)
 
-def get_products(
-    db: Session,
+USER_LIST_COLUMNS = (
+    User.id, User.email, User.first_name, User.last_name, User.phone,
+    User.address, User.city, User.country, User.is_active, User.created_at
+)
+
+# sort_by value -> column, resolved once instead of a getattr per request
+PRODUCT_SORT_COLUMNS = {field.value: getattr(Product, field.value) for field in PRODUCT_SORT_FIELDS}
+USER_SORT_COLUMNS = {field.value: getattr(User, field.value) for field in USER_SORT_FIELDS}
+ORDER_SORT_COLUMNS = {field.value: getattr(Order, field.value) for field in ORDER_SORT_FIELDS}
+
+
+def _cursor_value(column, raw: Optional[str]) -> Any:
+    """
+    Convert a keyset cursor value from the query string to the column's type.
+    On a nullable column a missing value means the last row seen sorted as NULL.
+    """
+    if raw is None:
+        if column.nullable:
+            return None
+        raise ValueError("after_value is required when sorting by a column other than id")
+    enums = getattr(column.type, "enums", None)
+    if enums and raw not in enums:
+        raise ValueError(f"after_value must be one of: {', '.join(enums)}")
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    return python_type(raw)
+
+
+def _apply_sort(
+    query: Select,
+    sort_column,
+    id_column,
+    sort_order: str,
+    after_id: Optional[int] = None,
+    after_value: Optional[str] = None
+) -> Tuple[Select, Optional[Select]]:
+    """
+    Order by the sort column with id as tiebreaker. When a keyset cursor is given,
+    seek past it with a row comparison so deep pages cost the same as the first.
+    
+    Returns the page query plus, for a nullable sort column, the query for the
+    rows that follow it in another block (or None). A row comparison is NULL
+    when the sort value is, and OR-ing the NULL rows into the seek would stop
+    Postgres from scanning the index in order, so they are fetched separately.
+    NULLs sort last ascending and first descending, as Postgres does by default.
+    """
+    descending = sort_order.lower() == "desc"
+    columns = (sort_column,) if sort_column is id_column else (sort_column, id_column)
+    nullable = sort_column is not id_column and sort_column.nullable
+    
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    if nullable:
+        ordering[0] = ordering[0].nulls_first() if descending else ordering[0].nulls_last()
+    
+    if after_id is None:
+        return query.order_by(*ordering), None
+    past_id = id_column < after_id if descending else id_column > after_id
+    if sort_column is id_column:
+        return query.where(past_id).order_by(*ordering), None
+    
+    id_order = id_column.desc() if descending else id_column.asc()
+    value = _cursor_value(sort_column, after_value)
+    if value is None:
+        # Cursor inside the NULL block; descending, every non-NULL row comes after it
+        nulls = query.where(sort_column.is_(None), past_id).order_by(id_order)
+        rest = query.where(sort_column.isnot(None)).order_by(*ordering) if descending else None
+        return nulls, rest
+    
+    key = tuple_(*columns)
+    cursor = tuple_(literal(value, sort_column.type), after_id)
+    seek = query.where(key < cursor if descending else key > cursor).order_by(*ordering)
+    # Ascending, the NULL block follows every value
+    nulls = query.where(sort_column.is_(None)).order_by(id_order) if nullable and not descending else None
+    return seek, nulls
+
+
+async def _paginate(
+    db: AsyncSession,
+    stmt: Select,
+    skip: int,
+    limit: int,
+    sort_by: str,
+    as_dicts: bool = False,
+    keyset: bool = False,
+    following: Optional[Select] = None
+) -> Dict[str, Any]:
+    """
+    Fetch one page of ``stmt`` together with the total match count.
+    The count is computed as a window column so Postgres filters the table once
+    instead of running a separate COUNT(*) query.
+    With ``as_dicts`` the selected columns come back as plain dicts instead of
+    the first (entity) column of each row.
+    Keyset pages skip the count entirely (total, page and pages are None), since
+    counting every match would defeat the seek. ``following`` (from _apply_sort)
+    tops up a short keyset page with the next block of rows.
+    """
+    keys = stmt.selected_columns.keys()
+    
+    # One extra row tells whether another page exists, so a full last page
+    # doesn't hand out a cursor to an empty page
+    if keyset:
+        rows = (await db.execute(stmt.limit(limit + 1))).all()
+        if following is not None and len(rows) <= limit:
+            rows += (await db.execute(following.limit(limit + 1 - len(rows)))).all()
+        total = None
+    else:
+        rows = (await db.execute(
+            stmt.add_columns(func.count().over().label("total")).offset(skip).limit(limit + 1)
+        )).all()
+        
+        if rows:
+            total = rows[0].total
+        elif skip:
+            # Page past the end: the window has no rows to report the total on
+            total = await db.scalar(
+                select(func.count()).select_from(stmt.order_by(None).subquery())
+            )
+        else:
+            total = 0
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if as_dicts:
+        # zip() stops before the trailing window column
+        items = [dict(zip(keys, row)) for row in rows]
+    else:
+        items = [row[0] for row in rows]
+    
+    next_cursor = None
+    if has_more:
+        last = items[-1]
+        next_cursor = {
+            "after_id": last["id"] if as_dicts else last.id,
+            "after_value": last[sort_by] if as_dicts else getattr(last, sort_by)
+        }
+    
+    return {
+        "items": items,
+        "total": total,
+        "page": None if keyset else (skip // limit) + 1,
+        "size": limit,
+        "pages": None if keyset else math.ceil(total / limit),
+        "next_cursor": next_cursor
+    }
+
+
+async def get_products(
+    db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
@@ -19,20 +176,19 @@ def get_products(
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     sort_by: str = "id",
-    sort_order: str = "asc"
+    sort_order: str = "asc",
+    after_id: Optional[int] = None,
+    after_value: Optional[str] = None
 ) -> Dict[str, Any]:
     
-    query = db.query(Product)
+    # List pages never show the description, so leave the Text column behind
+    query = select(*PRODUCT_LIST_COLUMNS)
     
     # Apply filters
     filters = []
     if search:
-        search_filter = or_(
-            Product.name.ilike(f"%{search}%"),
-            Product.description.ilike(f"%{search}%"),
-            Product.brand.ilike(f"%{search}%")
-        )
-        filters.append(search_filter)
+        # Single GIN probe on the generated tsvector instead of three ILIKE scans
+        filters.append(Product.search_tsv.op("@@")(func.plainto_tsquery("english", search)))
     
     if category:
         filters.append(Product.category == category)
@@ -47,51 +203,42 @@ def get_products(
         filters.append(Product.price <= max_price)
     
     if filters:
-        query = query.filter(and_(*filters))
-    
-    # Get total count for pagination
-    total = query.count()
+        query = query.where(and_(*filters))
     
     # Apply sorting
-    sort_column = getattr(Product, sort_by, Product.id)
-    if sort_order.lower() == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
+    sort_column = PRODUCT_SORT_COLUMNS.get(sort_by, Product.id)
+    query, following = _apply_sort(query, sort_column, Product.id, sort_order, after_id, after_value)
     
     # Apply pagination
-    items = query.offset(skip).limit(limit).all()
-    
-    return {
-        "items": items,
-        "total": total,
-        "page": (skip // limit) + 1,
-        "size": limit,
-        "pages": math.ceil(total / limit)
-    }
+    return await _paginate(db, query, skip, limit, sort_column.key, as_dicts=True, keyset=after_id is not None, following=following)
+
+async def get_product(db: AsyncSession, product_id: int):
+    return await db.get(Product, product_id)
 
-def get_product(db: Session, product_id: int):
-    return db.query(Product).filter(Product.id == product_id).first()
+async def get_products_by_ids(db: AsyncSession, product_ids: List[int]) -> List[Product]:
+    result = await db.execute(select(Product).where(Product.id.in_(product_ids)))
+    return list(result.scalars())
 
-def get_users(
-    db: Session,
+async def get_users(
+    db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
     city: Optional[str] = None,
     country: Optional[str] = None,
     sort_by: str = "id",
-    sort_order: str = "asc"
+    sort_order: str = "asc",
+    after_id: Optional[int] = None,
+    after_value: Optional[str] = None
 ) -> Dict[str, Any]:
     
-    query = db.query(User)
+    query = select(*USER_LIST_COLUMNS)
     
     # Apply filters
     filters = []
     if search:
         search_filter = or_(
-            User.first_name.ilike(f"%{search}%"),
-            User.last_name.ilike(f"%{search}%"),
+            User.search_tsv.op("@@")(func.plainto_tsquery("simple", search)),
             User.email.ilike(f"%{search}%")
         )
         filters.append(search_filter)
@@ -103,40 +250,32 @@ def get_users(
         filters.append(User.country == country)
     
     if filters:
-        query = query.filter(and_(*filters))
-    
-    total = query.count()
+        query = query.where(and_(*filters))
     
     # Apply sorting
-    sort_column = getattr(User, sort_by, User.id)
-    if sort_order.lower() == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
+    sort_column = USER_SORT_COLUMNS.get(sort_by, User.id)
+    query, following = _apply_sort(query, sort_column, User.id, sort_order, after_id, after_value)
     
-    items = query.offset(skip).limit(limit).all()
-    
-    return {
-        "items": items,
-        "total": total,
-        "page": (skip // limit) + 1,
-        "size": limit,
-        "pages": math.ceil(total / limit)
-    }
+    return await _paginate(db, query, skip, limit, sort_column.key, as_dicts=True, keyset=after_id is not None, following=following)
 
-def get_orders(
-    db: Session,
+async def get_orders(
+    db: AsyncSession,
     skip: int = 0,
     limit: int = 100,
     user_id: Optional[int] = None,
     status: Optional[str] = None,
     sort_by: str = "id",
-    sort_order: str = "asc"
+    sort_order: str = "asc",
+    after_id: Optional[int] = None,
+    after_value: Optional[str] = None
 ) -> Dict[str, Any]:
     
-    query = db.query(Order).options(
-        joinedload(Order.user),
-        joinedload(Order.product)
+    # selectinload fetches users/products with one IN query each instead of
+    # widening every order row; raiseload guards against stray lazy loads
+    query = select(Order).options(
+        selectinload(Order.user),
+        selectinload(Order.product),
+        raiseload("*")
     )
     
     filters = []
@@ -147,57 +286,52 @@ def get_orders(
         filters.append(Order.status == status)
     
     if filters:
-        query = query.filter(and_(*filters))
-    
-    total = query.count()
+        query = query.where(and_(*filters))
     
     # Apply sorting
-    sort_column = getattr(Order, sort_by, Order.id)
-    if sort_order.lower() == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
+    sort_column = ORDER_SORT_COLUMNS.get(sort_by, Order.id)
+    query, following = _apply_sort(query, sort_column, Order.id, sort_order, after_id, after_value)
     
-    items = query.offset(skip).limit(limit).all()
-    
-    return {
-        "items": items,
-        "total": total,
-        "page": (skip // limit) + 1,
-        "size": limit,
-        "pages": math.ceil(total / limit)
-    }
+    return await _paginate(db, query, skip, limit, sort_column.key, keyset=after_id is not None, following=following)
 
-def get_user(db: Session, user_id: int):
-    return db.query(User).filter(User.id == user_id).first()
+async def get_user(db: AsyncSession, user_id: int):
+    return await db.get(User, user_id)
 
-def get_order(db: Session, order_id: int):
-    return db.query(Order).options(
-        joinedload(Order.user),
-        joinedload(Order.product)
-    ).filter(Order.id == order_id).first()
+async def get_order(db: AsyncSession, order_id: int):
+    return await db.get(Order, order_id, options=[
+        selectinload(Order.user),
+        selectinload(Order.product)
+    ])
 
-def truncate_all_data(db: Session) -> Dict[str, Any]:
+async def get_stats(db: AsyncSession) -> Dict[str, int]:
+    """
+    Collect all dashboard counts in one round-trip, scanning each table once
+    with FILTER for the active counts.
+    """
+    result = await db.execute(text("""
+        SELECT p.total_products, u.total_users, o.total_orders, p.active_products, u.active_users
+        FROM (SELECT count(*) AS total_products, count(*) FILTER (WHERE is_active) AS active_products FROM products) p,
+             (SELECT count(*) AS total_users, count(*) FILTER (WHERE is_active) AS active_users FROM users) u,
+             (SELECT count(*) AS total_orders FROM orders) o
+    """))
+    return dict(result.mappings().one())
+
+async def truncate_all_data(db: AsyncSession) -> Dict[str, Any]:
     """
     Truncate all data from the database tables.
-    Deletes all records from orders, users, and products tables in the correct order
-    to respect foreign key constraints.
+    Counts the existing rows in a single round-trip, then empties orders, users and
+    products with one TRUNCATE, which is O(1) in table size unlike DELETE.
     """
     try:
-        # Delete in order to respect foreign key constraints
-        # Orders first (has foreign keys to users and products)
-        orders_deleted = db.query(Order).count()
-        db.query(Order).delete()
-        
-        # Then users and products (no dependencies between them)
-        users_deleted = db.query(User).count()
-        db.query(User).delete()
+        orders_deleted, users_deleted, products_deleted = (await db.execute(text(
+            "SELECT (SELECT count(*) FROM orders), (SELECT count(*) FROM users), (SELECT count(*) FROM products)"
+        ))).one()
         
-        products_deleted = db.query(Product).count()
-        db.query(Product).delete()
+        # One statement covers all three tables, so foreign key order doesn't matter
+        await db.execute(text("TRUNCATE TABLE orders, users, products RESTART IDENTITY CASCADE"))
         
         # Commit the transaction
-        db.commit()
+        await db.commit()
         
         return {
             "success": True,
@@ -209,7 +343,7 @@ def truncate_all_data(db: Session) -> Dict[str, Any]:
             }
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         return {
             "success": False,
             "message": f"Error truncating data: {str(e)}",
@@ -1,22 +1,59 @@
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import Any, Optional, Tuple, Union
 from cache import cache
 import time
-import hashlib
-from fastapi import FastAPI, Depends, HTTPException, Query, Path
+import orjson
+from fastapi import FastAPI, Depends, HTTPException, Query, Path, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from crud import get_products as get_products_crud, get_orders as get_orders_crud, get_users as get_users_crud, get_product as get_product_crud, get_user as get_user_crud, get_order as get_order_crud, truncate_all_data
+from pydantic import ValidationError
+from crud import get_products as get_products_crud, get_orders as get_orders_crud, get_users as get_users_crud, get_product as get_product_crud, get_products_by_ids as get_products_by_ids_crud, get_user as get_user_crud, get_order as get_order_crud, get_stats as get_stats_crud, truncate_all_data
 from schemas import (
-    PaginatedResponse, Product as SchemaProduct, User as SchemaUser, Order as SchemaOrder,
-    ProductQueryParams, UserQueryParams, OrderQueryParams, SortOrder
+    PaginatedResponse, ProductSummary, Product as SchemaProduct, User as SchemaUser, Order as SchemaOrder,
+    ProductQueryParams, UserQueryParams, OrderQueryParams,
+    parse_product_qp, parse_user_qp, parse_order_qp, query_params_openapi,
+    PRODUCT_ADAPTER, USER_ADAPTER, ORDER_ADAPTER, ORDER_PAGE_ADAPTER
 )
-from models import Product, User, Order, Base
-from database import engine, get_db
+from models import Product, Base, add_search_columns, convert_order_status
+from sqlalchemy import text
+from database import engine, get_db, get_sync_db, WEB_WORKERS
 from seed_data import seed_all_data
 
-Base.metadata.create_all(bind=engine)
+# Arbitrary app-wide key for the advisory lock that serializes schema creation
+SCHEMA_LOCK_ID = 7_246_001
+
+def init_schema():
+    """
+    Create the schema once per startup. With several workers each one runs this,
+    so on Postgres they queue on an advisory lock instead of racing on
+    CREATE EXTENSION / CREATE TYPE / CREATE TABLE.
+    """
+    with engine.connect() as conn:
+        locked = conn.dialect.name == "postgresql"
+        if locked:
+            conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": SCHEMA_LOCK_ID})
+            conn.commit()
+        try:
+            Base.metadata.create_all(bind=conn)
+            add_search_columns(conn)
+            convert_order_status(conn)
+            conn.commit()
+        finally:
+            if locked:
+                conn.rollback()
+                conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": SCHEMA_LOCK_ID})
+                conn.commit()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(init_schema)
+    yield
 
 app = FastAPI(
+    lifespan=lifespan,
     title="High-Performance Data API",
     description="FastAPI backend for handling 100k+ records with <100ms response times",
     version="1.0.0"
@@ -40,415 +77,358 @@ async def add_process_time_header(request, call_next):
     response.headers["X-Process-Time"] = str(process_time)
     return response
 
-def generate_cache_key(endpoint: str, **params) -> str:
-    """Generate a cache key based on endpoint and parameters"""
-    param_str = "&".join([f"{k}={v}" for k, v in sorted(params.items()) if v is not None])
-    cache_string = f"{endpoint}?{param_str}"
-    return hashlib.md5(cache_string.encode()).hexdigest()
+def generate_cache_key(prefix: str, *values) -> str:
+    """
+    Generate a cache key such as ``products:[1,50,null,"Electronics",...]`` from
+    parameter values in the fixed order the caller lists them. JSON-encoding the
+    values keeps None distinct from "" and stops a ":" inside a search term from
+    shifting the fields; the prefix allows ``clear_pattern("products:*")``.
+    """
+    return prefix + ":" + orjson.dumps(values).decode()
+
+def cached_response(payload: bytes) -> Response:
+    """
+    Serve a cache hit as the stored JSON bytes. Returning a Response directly
+    skips FastAPI's response_model validation and re-serialization.
+    """
+    return Response(content=payload, media_type="application/json", headers={"X-Cache": "HIT"})
+
+async def cache_response(cache_key: str, data: Any, ttl: int) -> Response:
+    """
+    Serve a cache miss: encode the payload once, store those bytes and send the
+    same bytes to the client instead of letting FastAPI serialize it again.
+    ``data`` may already be JSON bytes (e.g. from a TypeAdapter.dump_json).
+    """
+    payload = data if isinstance(data, bytes) else orjson.dumps(data)
+    await cache.set_raw(cache_key, payload, ttl=ttl)
+    return Response(content=payload, media_type="application/json", headers={"X-Cache": "MISS"})
+
+# Key patterns owned by the data endpoints; writes only invalidate these
+DATA_CACHE_PATTERNS = ("products:*", "product_*", "users:*", "user_*", "orders:*", "order_*", "stats")
+
+async def invalidate_data_cache(patterns: Tuple[str, ...] = DATA_CACHE_PATTERNS) -> int:
+    return sum([await cache.clear_pattern(pattern) for pattern in patterns])
+
+def product_to_dict(product: Product) -> dict:
+    return SchemaProduct.from_orm_fast(product).model_dump()
+
+async def get_products_batch(ids: str, db: AsyncSession) -> Response:
+    """
+    Resolve several products with one Redis MGET and at most one DB query. Items
+    are full products (with description), encoded once like the list paths.
+    """
+    try:
+        product_ids = list(dict.fromkeys(int(i) for i in ids.split(",") if i.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if not product_ids or len(product_ids) > 1000 or min(product_ids) < 1:
+        raise HTTPException(status_code=400, detail="ids must contain between 1 and 1000 positive IDs")
+    
+    cached = dict(zip(product_ids, await cache.mget([f"product_{i}" for i in product_ids])))
+    missing = [product_id for product_id, item in cached.items() if item is None]
+    if missing:
+        fetched = {product.id: product_to_dict(product) for product in await get_products_by_ids_crud(db, missing)}
+        await cache.mset({f"product_{product_id}": item for product_id, item in fetched.items()}, ttl=600)
+        cached.update(fetched)
+    
+    items = [cached[product_id] for product_id in product_ids if cached[product_id] is not None]
+    return Response(content=orjson.dumps({
+        "items": items,
+        "total": len(items),
+        "page": 1,
+        "size": len(product_ids),
+        "pages": 1 if items else 0,
+        "next_cursor": None
+    }), media_type="application/json")
+
+def query_params_dependency(parse):
+    """
+    Dependency that validates the raw query string with a prebuilt TypeAdapter
+    instead of letting FastAPI resolve each model field per request.
+    """
+    async def dependency(request: Request):
+        try:
+            return parse(request.query_params)
+        except ValidationError as e:
+            raise RequestValidationError([
+                {**error, "loc": ("query", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ])
+    return dependency
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Assessment API", "status": "running"}
 
 @app.post("/seed-data")
-def seed_database(db: Session = Depends(get_db)):
+async def seed_database(db: Session = Depends(get_sync_db)):
     """Seed the database with sample data"""
     try:
-        seed_all_data(db)
-        cache.clear_pattern("*")  # Clear all cached data
+        # Seeding is bulk sync work, keep it off the event loop
+        await run_in_threadpool(seed_all_data, db)
+        await invalidate_data_cache()
         return {"message": "Database seeded successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/products", response_model=PaginatedResponse)
-def get_products(
-    params: ProductQueryParams = Depends(),
-    db: Session = Depends(get_db)
+@app.get(
+    "/products",
+    # Summaries for list pages, full products for an ?ids= batch
+    response_model=Union[PaginatedResponse[ProductSummary], PaginatedResponse[SchemaProduct]],
+    openapi_extra=query_params_openapi(ProductQueryParams)
+)
+async def get_products(
+    params: ProductQueryParams = Depends(query_params_dependency(parse_product_qp)),
+    ids: Optional[str] = Query(None, description="Comma-separated product IDs to fetch in one call"),
+    db: AsyncSession = Depends(get_db)
 ):
-    # Additional validation for sort_order
-    if params.sort_order.value not in ['asc', 'desc']:
-        raise HTTPException(
-            status_code=400, 
-            detail="sort_order must be either 'asc' or 'desc'"
-        )
-    
-    # Validate other parameters
-    if params.page < 1:
-        raise HTTPException(status_code=400, detail="Page must be greater than 0")
-    if params.size < 1 or params.size > 1000:
-        raise HTTPException(status_code=400, detail="Size must be between 1 and 1000")
+    if ids is not None:
+        return await get_products_batch(ids, db)
     
     # Generate cache key
     cache_key = generate_cache_key(
         "products",
-        page=params.page,
-        size=params.size,
-        search=params.search,
-        category=params.category,
-        brand=params.brand,
-        min_price=params.min_price,
-        max_price=params.max_price,
-        sort_by=params.sort_by.value,
-        sort_order=params.sort_order.value
+        params.page,
+        params.size,
+        params.search,
+        params.category,
+        params.brand,
+        params.min_price,
+        params.max_price,
+        params.sort_by.value,
+        params.sort_order.value,
+        params.after_id,
+        params.after_value
     )
     
     # Try to get from cache
-    cached_result = cache.get(cache_key)
+    cached_result = await cache.get_raw(cache_key)
     if cached_result:
-        return cached_result
+        return cached_response(cached_result)
     
     skip = (params.page - 1) * params.size
-    result = get_products_crud(
-        db=db,
-        skip=skip,
-        limit=params.size,
-        search=params.search,
-        category=params.category,
-        brand=params.brand,
-        min_price=params.min_price,
-        max_price=params.max_price,
-        sort_by=params.sort_by.value,
-        sort_order=params.sort_order.value
-    )
-    
-    # Convert SQLAlchemy objects to dict for JSON serialization
-    items_dict = [{
-        "id": item.id,
-        "name": item.name,
-        "description": item.description,
-        "price": item.price,
-        "category": item.category,
-        "brand": item.brand,
-        "stock_quantity": item.stock_quantity,
-        "rating": item.rating,
-        "is_active": item.is_active,
-        "created_at": item.created_at.isoformat(),
-        "updated_at": item.updated_at.isoformat()
-    } for item in result["items"]]
+    try:
+        result = await get_products_crud(
+            db=db,
+            skip=skip,
+            limit=params.size,
+            search=params.search,
+            category=params.category,
+            brand=params.brand,
+            min_price=params.min_price,
+            max_price=params.max_price,
+            sort_by=params.sort_by.value,
+            sort_order=params.sort_order.value,
+            after_id=params.after_id,
+            after_value=params.after_value
+        )
+    except ValueError as e:
+        # Malformed keyset cursor
+        raise HTTPException(status_code=400, detail=str(e))
     
     response_data = {
-        "items": items_dict,
+        "items": result["items"],
         "total": result["total"],
         "page": result["page"],
         "size": result["size"],
-        "pages": result["pages"]
+        "pages": result["pages"],
+        "next_cursor": result["next_cursor"]
     }
     
     # Cache the result for 5 minutes
-    cache.set(cache_key, response_data, ttl=300)
-    
-    return response_data
+    return await cache_response(cache_key, response_data, ttl=300)
 
 @app.get("/products/{product_id}", response_model=SchemaProduct)
-def get_product(product_id: int = Path(..., ge=1), db: Session = Depends(get_db)):
+async def get_product(product_id: int = Path(..., ge=1), db: AsyncSession = Depends(get_db)):
     if product_id < 1:
         raise HTTPException(status_code=400, detail="Product ID must be greater than 0")
     
     cache_key = f"product_{product_id}"
     
-    cached_result = cache.get(cache_key)
+    # Sliding TTL: frequently viewed items stay cached
+    cached_result = await cache.get_raw(cache_key, refresh_ttl=600)
     if cached_result:
-        return cached_result
+        return cached_response(cached_result)
     
-    product = get_product_crud(db, product_id=product_id)
+    product = await get_product_crud(db, product_id=product_id)
     if product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    product_dict = {
-        "id": product.id,
-        "name": product.name,
-        "description": product.description,
-        "price": product.price,
-        "category": product.category,
-        "brand": product.brand,
-        "stock_quantity": product.stock_quantity,
-        "rating": product.rating,
-        "is_active": product.is_active,
-        "created_at": product.created_at.isoformat(),
-        "updated_at": product.updated_at.isoformat()
-    }
-    
-    cache.set(cache_key, product_dict, ttl=600)
-    return product_dict
+    return await cache_response(
+        cache_key, PRODUCT_ADAPTER.dump_json(SchemaProduct.from_orm_fast(product)), ttl=600
+    )
 
 
 
-@app.get("/users", response_model=PaginatedResponse)
-def get_users(
-    params: UserQueryParams = Depends(),
-    db: Session = Depends(get_db)
+@app.get(
+    "/users",
+    response_model=PaginatedResponse[SchemaUser],
+    openapi_extra=query_params_openapi(UserQueryParams)
+)
+async def get_users(
+    params: UserQueryParams = Depends(query_params_dependency(parse_user_qp)),
+    db: AsyncSession = Depends(get_db)
 ):
-    # Additional validation for sort_order
-    if params.sort_order.value not in ['asc', 'desc']:
-        raise HTTPException(
-            status_code=400, 
-            detail="sort_order must be either 'asc' or 'desc'"
-        )
-    
-    # Validate other parameters
-    if params.page < 1:
-        raise HTTPException(status_code=400, detail="Page must be greater than 0")
-    if params.size < 1 or params.size > 1000:
-        raise HTTPException(status_code=400, detail="Size must be between 1 and 1000")
-    
     cache_key = generate_cache_key(
         "users",
-        page=params.page,
-        size=params.size,
-        search=params.search,
-        city=params.city,
-        country=params.country,
-        sort_by=params.sort_by.value,
-        sort_order=params.sort_order.value
+        params.page,
+        params.size,
+        params.search,
+        params.city,
+        params.country,
+        params.sort_by.value,
+        params.sort_order.value,
+        params.after_id,
+        params.after_value
     )
     
-    cached_result = cache.get(cache_key)
+    cached_result = await cache.get_raw(cache_key)
     if cached_result:
-        return cached_result
+        return cached_response(cached_result)
     
     skip = (params.page - 1) * params.size
-    result = get_users_crud(
-        db=db,
-        skip=skip,
-        limit=params.size,
-        search=params.search,
-        city=params.city,
-        country=params.country,
-        sort_by=params.sort_by.value,
-        sort_order=params.sort_order.value
-    )
-    
-    items_dict = [{
-        "id": item.id,
-        "email": item.email,
-        "first_name": item.first_name,
-        "last_name": item.last_name,
-        "phone": item.phone,
-        "address": item.address,
-        "city": item.city,
-        "country": item.country,
-        "is_active": item.is_active,
-        "created_at": item.created_at.isoformat()
-    } for item in result["items"]]
+    try:
+        result = await get_users_crud(
+            db=db,
+            skip=skip,
+            limit=params.size,
+            search=params.search,
+            city=params.city,
+            country=params.country,
+            sort_by=params.sort_by.value,
+            sort_order=params.sort_order.value,
+            after_id=params.after_id,
+            after_value=params.after_value
+        )
+    except ValueError as e:
+        # Malformed keyset cursor
+        raise HTTPException(status_code=400, detail=str(e))
     
     response_data = {
-        "items": items_dict,
+        "items": result["items"],
         "total": result["total"],
         "page": result["page"],
         "size": result["size"],
-        "pages": result["pages"]
+        "pages": result["pages"],
+        "next_cursor": result["next_cursor"]
     }
     
-    cache.set(cache_key, response_data, ttl=300)
-    return response_data
+    return await cache_response(cache_key, response_data, ttl=300)
 
-@app.get("/orders", response_model=PaginatedResponse)
-def get_orders(
-    params: OrderQueryParams = Depends(),
-    db: Session = Depends(get_db)
+@app.get(
+    "/orders",
+    response_model=PaginatedResponse[SchemaOrder],
+    openapi_extra=query_params_openapi(OrderQueryParams)
+)
+async def get_orders(
+    params: OrderQueryParams = Depends(query_params_dependency(parse_order_qp)),
+    db: AsyncSession = Depends(get_db)
 ):
-    # Additional validation for sort_order
-    if params.sort_order.value not in ['asc', 'desc']:
-        raise HTTPException(
-            status_code=400, 
-            detail="sort_order must be either 'asc' or 'desc'"
-        )
-    
-    # Validate other parameters
-    if params.page < 1:
-        raise HTTPException(status_code=400, detail="Page must be greater than 0")
-    if params.size < 1 or params.size > 1000:
-        raise HTTPException(status_code=400, detail="Size must be between 1 and 1000")
-    if params.user_id is not None and params.user_id < 1:
-        raise HTTPException(status_code=400, detail="User ID must be greater than 0")
-    
     cache_key = generate_cache_key(
         "orders",
-        page=params.page,
-        size=params.size,
-        user_id=params.user_id,
-        status=params.status.value if params.status else None,
-        sort_by=params.sort_by.value,
-        sort_order=params.sort_order.value
+        params.page,
+        params.size,
+        params.user_id,
+        params.status.value if params.status else None,
+        params.sort_by.value,
+        params.sort_order.value,
+        params.after_id,
+        params.after_value
     )
     
-    cached_result = cache.get(cache_key)
+    cached_result = await cache.get_raw(cache_key)
     if cached_result:
-        return cached_result
+        return cached_response(cached_result)
     
     skip = (params.page - 1) * params.size
-    result = get_orders_crud(
-        db=db,
-        skip=skip,
-        limit=params.size,
-        user_id=params.user_id,
-        status=params.status.value if params.status else None,
-        sort_by=params.sort_by.value,
-        sort_order=params.sort_order.value
+    try:
+        result = await get_orders_crud(
+            db=db,
+            skip=skip,
+            limit=params.size,
+            user_id=params.user_id,
+            status=params.status.value if params.status else None,
+            sort_by=params.sort_by.value,
+            sort_order=params.sort_order.value,
+            after_id=params.after_id,
+            after_value=params.after_value
+        )
+    except ValueError as e:
+        # Malformed keyset cursor
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Rows come straight from the DB, so wrap them without re-validating and
+    # let pydantic-core serialize the whole page in one pass
+    page = PaginatedResponse[SchemaOrder].model_construct(
+        items=[SchemaOrder.from_orm_fast(item) for item in result["items"]],
+        total=result["total"],
+        page=result["page"],
+        size=result["size"],
+        pages=result["pages"],
+        next_cursor=result["next_cursor"]
     )
     
-    items_dict = [{
-        "id": item.id,
-        "user_id": item.user_id,
-        "product_id": item.product_id,
-        "quantity": item.quantity,
-        "unit_price": item.unit_price,
-        "total_amount": item.total_amount,
-        "status": item.status,
-        "order_date": item.order_date.isoformat(),
-        "user": {
-            "id": item.user.id,
-            "email": item.user.email,
-            "first_name": item.user.first_name,
-            "last_name": item.user.last_name,
-            "phone": item.user.phone,
-            "address": item.user.address,
-            "city": item.user.city,
-            "country": item.user.country,
-            "is_active": item.user.is_active,
-            "created_at": item.user.created_at.isoformat()
-        } if item.user else None,
-        "product": {
-            "id": item.product.id,
-            "name": item.product.name,
-            "description": item.product.description,
-            "price": item.product.price,
-            "category": item.product.category,
-            "brand": item.product.brand,
-            "stock_quantity": item.product.stock_quantity,
-            "rating": item.product.rating,
-            "is_active": item.product.is_active,
-            "created_at": item.product.created_at.isoformat(),
-            "updated_at": item.product.updated_at.isoformat()
-        } if item.product else None
-    } for item in result["items"]]
-    
-    response_data = {
-        "items": items_dict,
-        "total": result["total"],
-        "page": result["page"],
-        "size": result["size"],
-        "pages": result["pages"]
-    }
-    
-    cache.set(cache_key, response_data, ttl=300)
-    return response_data
+    return await cache_response(cache_key, ORDER_PAGE_ADAPTER.dump_json(page), ttl=300)
 
 @app.get("/users/{user_id}", response_model=SchemaUser)
-def get_user(user_id: int = Path(..., ge=1), db: Session = Depends(get_db)):
+async def get_user(user_id: int = Path(..., ge=1), db: AsyncSession = Depends(get_db)):
     if user_id < 1:
         raise HTTPException(status_code=400, detail="User ID must be greater than 0")
     
     cache_key = f"user_{user_id}"
     
-    cached_result = cache.get(cache_key)
+    # Sliding TTL: frequently viewed items stay cached
+    cached_result = await cache.get_raw(cache_key, refresh_ttl=600)
     if cached_result:
-        return cached_result
+        return cached_response(cached_result)
     
-    user = get_user_crud(db, user_id=user_id)
+    user = await get_user_crud(db, user_id=user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     
-    user_dict = {
-        "id": user.id,
-        "email": user.email,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "phone": user.phone,
-        "address": user.address,
-        "city": user.city,
-        "country": user.country,
-        "is_active": user.is_active,
-        "created_at": user.created_at.isoformat()
-    }
-    
-    cache.set(cache_key, user_dict, ttl=600)
-    return user_dict
+    return await cache_response(cache_key, USER_ADAPTER.dump_json(SchemaUser.from_orm_fast(user)), ttl=600)
 
 @app.get("/orders/{order_id}", response_model=SchemaOrder)
-def get_order(order_id: int = Path(..., ge=1), db: Session = Depends(get_db)):
+async def get_order(order_id: int = Path(..., ge=1), db: AsyncSession = Depends(get_db)):
     if order_id < 1:
         raise HTTPException(status_code=400, detail="Order ID must be greater than 0")
     
     cache_key = f"order_{order_id}"
     
-    cached_result = cache.get(cache_key)
+    # Sliding TTL: frequently viewed items stay cached
+    cached_result = await cache.get_raw(cache_key, refresh_ttl=600)
     if cached_result:
-        return cached_result
+        return cached_response(cached_result)
     
-    order = get_order_crud(db, order_id=order_id)
+    order = await get_order_crud(db, order_id=order_id)
     if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
     
-    order_dict = {
-        "id": order.id,
-        "user_id": order.user_id,
-        "product_id": order.product_id,
-        "quantity": order.quantity,
-        "unit_price": order.unit_price,
-        "total_amount": order.total_amount,
-        "status": order.status,
-        "order_date": order.order_date.isoformat(),
-        "user": {
-            "id": order.user.id,
-            "email": order.user.email,
-            "first_name": order.user.first_name,
-            "last_name": order.user.last_name,
-            "phone": order.user.phone,
-            "address": order.user.address,
-            "city": order.user.city,
-            "country": order.user.country,
-            "is_active": order.user.is_active,
-            "created_at": order.user.created_at.isoformat()
-        } if order.user else None,
-        "product": {
-            "id": order.product.id,
-            "name": order.product.name,
-            "description": order.product.description,
-            "price": order.product.price,
-            "category": order.product.category,
-            "brand": order.product.brand,
-            "stock_quantity": order.product.stock_quantity,
-            "rating": order.product.rating,
-            "is_active": order.product.is_active,
-            "created_at": order.product.created_at.isoformat(),
-            "updated_at": order.product.updated_at.isoformat()
-        } if order.product else None
-    }
-    
-    cache.set(cache_key, order_dict, ttl=600)
-    return order_dict
+    return await cache_response(cache_key, ORDER_ADAPTER.dump_json(SchemaOrder.from_orm_fast(order)), ttl=600)
 
 @app.get("/stats")
-def get_stats(db: Session = Depends(get_db)):
+async def get_stats(db: AsyncSession = Depends(get_db)):
     """Get database statistics"""
     cache_key = "stats"
-    cached_result = cache.get(cache_key)
+    cached_result = await cache.get_raw(cache_key)
     if cached_result:
-        return cached_result
+        return cached_response(cached_result)
     
-    stats = {
-        "total_products": db.query(Product).count(),
-        "total_users": db.query(User).count(),
-        "total_orders": db.query(Order).count(),
-        "active_products": db.query(Product).filter(Product.is_active == True).count(),
-        "active_users": db.query(User).filter(User.is_active == True).count()
-    }
+    stats = await get_stats_crud(db)
     
-    cache.set(cache_key, stats, ttl=60)  # Cache for 1 minute
-    return stats
+    return await cache_response(cache_key, stats, ttl=300)  # Seeding/truncating invalidate it anyway
 
 @app.delete("/truncate-all")
-def truncate_all_data_endpoint(db: Session = Depends(get_db)):
+async def truncate_all_data_endpoint(db: AsyncSession = Depends(get_db)):
     """
     Truncate all data from the database.
     WARNING: This will permanently delete all products, users, and orders.
     """
     try:
-        result = truncate_all_data(db)
+        result = await truncate_all_data(db)
         
-        # Clear all Redis cache after truncating data
-        cache.clear_pattern("*")  # Clear all cached data
+        # Clear cached data endpoints after truncating data
+        await invalidate_data_cache()
         
         if result["success"]:
             return {
@@ -463,4 +443,12 @@ def truncate_all_data_endpoint(db: Session = Depends(get_db)):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=WEB_WORKERS,
+        log_level="warning"
+    )
\ No newline at end of file
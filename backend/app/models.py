@@ -1,12 +1,26 @@
 from datetime import datetime
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index, DDL, Computed, Enum, event, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from schemas import OrderStatus
 
 
 
 Base = declarative_base()
 
+# Trigram GIN indexes (gin_trgm_ops) need pg_trgm before the tables are created
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+
+def trigram_index(name: str, column: str) -> Index:
+    """GIN trigram index so ILIKE '%term%' searches avoid a sequential scan"""
+    return Index(name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+
 class Product(Base):
    
     __tablename__ = "products"
@@ -15,16 +29,31 @@ class Product(Base):
     name = Column(String(255), index=True)
     description = Column(Text)
     price = Column(Float, index=True)
-    category = Column(String(100), index=True)
-    brand = Column(String(100), index=True)
+    category = Column(String(100))
+    brand = Column(String(100))
     stock_quantity = Column(Integer, index=True)
     rating = Column(Float, index=True)
-    is_active = Column(Boolean, default=True, index=True)
+    is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Full-text document kept in sync by Postgres; deferred so list queries don't fetch it
+    search_tsv = deferred(Column(TSVECTOR, Computed(
+        "to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, '') || ' ' || coalesce(brand, ''))",
+        persisted=True
+    )))
+    
     # Relationships
     orders = relationship("Order", back_populates="product")
+    
+    # Composite indexes match the filter + sort shapes of the list endpoint and
+    # also serve single-column lookups on their leading column
+    __table_args__ = (
+        Index("ix_products_search_tsv", "search_tsv", postgresql_using="gin"),
+        Index("ix_products_cat_price", "category", "price"),
+        Index("ix_products_brand_rating", "brand", "rating"),
+        Index("ix_products_active_created", "is_active", "created_at"),
+    )
 
 class User(Base):
     __tablename__ = "users"
@@ -39,17 +68,76 @@ class User(Base):
     is_active = Column(Boolean, default=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # 'simple' config: names should not be stemmed or dropped as stop words
+    search_tsv = deferred(Column(TSVECTOR, Computed(
+        "to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, ''))",
+        persisted=True
+    )))
     orders = relationship("Order", back_populates="user")
+    
+    __table_args__ = (
+        Index("ix_users_search_tsv", "search_tsv", postgresql_using="gin"),
+        # Emails don't tokenize into useful words, keep substring search index-backed
+        trigram_index("ix_users_email_trgm", "email"),
+    )
+
+def add_search_columns(conn):
+    """
+    create_all() skips tables that already exist, so databases created before the
+    search_tsv columns get them (and their GIN indexes) added here. Safe to rerun.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    for table in (Product.__table__, User.__table__):
+        column = table.c.search_tsv
+        conn.execute(text(
+            f"ALTER TABLE {table.name} ADD COLUMN IF NOT EXISTS {column.name} tsvector "
+            f"GENERATED ALWAYS AS ({column.computed.sqltext}) STORED"
+        ))
+        for index in table.indexes:
+            if index.name.endswith("_search_tsv"):
+                index.create(bind=conn, checkfirst=True)
+
+# Declaration order is the enum's sort order in Postgres
+ORDER_STATUSES = tuple(status.value for status in OrderStatus)
 
 class Order(Base):
     __tablename__ = "orders"
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
     product_id = Column(Integer, ForeignKey("products.id"), index=True)
     quantity = Column(Integer)
     unit_price = Column(Float)
     total_amount = Column(Float, index=True)
-    status = Column(String(50), index=True)
+    # Native enum: 4 bytes per row instead of repeating the status text
+    status = Column(Enum(*ORDER_STATUSES, name='order_status'))
     order_date = Column(DateTime, default=datetime.utcnow, index=True)
     user = relationship("User", back_populates="orders")
-    product = relationship("Product", back_populates="orders")
\ No newline at end of file
+    product = relationship("Product", back_populates="orders")
+    
+    __table_args__ = (
+        Index("ix_orders_user_date", "user_id", "order_date"),
+        Index("ix_orders_status_date", "status", "order_date"),
+    )
+
+
+def convert_order_status(conn):
+    """
+    Databases created before the order_status enum keep orders.status as VARCHAR,
+    since create_all() skips existing tables (and TRUNCATE keeps column types).
+    Create the type and convert the column in place; the old 'processing' status
+    maps to 'confirmed'. Safe to rerun.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    status = Order.__table__.c.status
+    status.type.create(bind=conn, checkfirst=True)
+    column_type = conn.execute(text(
+        "SELECT udt_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'orders' AND column_name = 'status'"
+    )).scalar()
+    if column_type == "varchar":
+        conn.execute(text(
+            f"ALTER TABLE orders ALTER COLUMN status TYPE {status.type.name} USING "
+            f"(CASE WHEN status = 'processing' THEN 'confirmed' ELSE status END)::{status.type.name}"
+        ))
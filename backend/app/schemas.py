@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field, validator
+from typing import Generic, Optional, List, TypeVar
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 from pydantic import EmailStr
 from enum import Enum
 
@@ -19,11 +19,43 @@ class Product(ProductBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+    
+    @classmethod
+    def from_orm_fast(cls, row) -> "Product":
+        """Wrap a trusted DB row without running validation"""
+        return cls.model_construct(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            price=row.price,
+            category=row.category,
+            brand=row.brand,
+            stock_quantity=row.stock_quantity,
+            rating=row.rating,
+            is_active=row.is_active,
+            created_at=row.created_at,
+            updated_at=row.updated_at
+        )
+
+class ProductSummary(BaseModel):
+    """Product fields returned by list endpoints (no description)"""
+    id: int
+    name: str
+    price: float
+    category: str
+    brand: str
+    stock_quantity: int
+    rating: Optional[float] = None
+    is_active: bool = True
+    created_at: datetime
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
 
 class UserBase(BaseModel):
-    email: EmailStr
+    # Plain str: rows read back from the DB were already validated on the way in
+    email: str
     first_name: str
     last_name: str
     phone: Optional[str] = None
@@ -32,13 +64,40 @@ class UserBase(BaseModel):
     country: str
     is_active: bool = True
 
+class UserCreate(UserBase):
+    """API input: untrusted, so the full email check applies here only"""
+    email: EmailStr
+
 class User(UserBase):
    
     id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+    
+    @classmethod
+    def from_orm_fast(cls, row) -> "User":
+        """Wrap a trusted DB row without running validation"""
+        return cls.model_construct(
+            id=row.id,
+            email=row.email,
+            first_name=row.first_name,
+            last_name=row.last_name,
+            phone=row.phone,
+            address=row.address,
+            city=row.city,
+            country=row.country,
+            is_active=row.is_active,
+            created_at=row.created_at
+        )
+
+# Also defines the order_status database enum (models.ORDER_STATUSES)
+class OrderStatus(str, Enum):
+    pending = "pending"
+    confirmed = "confirmed"
+    shipped = "shipped"
+    delivered = "delivered"
+    cancelled = "cancelled"
 
 class OrderBase(BaseModel):
     user_id: int
@@ -46,7 +105,7 @@ class OrderBase(BaseModel):
     quantity: int
     unit_price: float
     total_amount: float
-    status: str
+    status: OrderStatus
 
 class Order(OrderBase):
     id: int
@@ -54,15 +113,34 @@ class Order(OrderBase):
     user: Optional[User] = None
     product: Optional[Product] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+    
+    @classmethod
+    def from_orm_fast(cls, row) -> "Order":
+        """Wrap a trusted DB row (with its loaded user/product) without running validation"""
+        return cls.model_construct(
+            id=row.id,
+            user_id=row.user_id,
+            product_id=row.product_id,
+            quantity=row.quantity,
+            unit_price=row.unit_price,
+            total_amount=row.total_amount,
+            status=OrderStatus(row.status),
+            order_date=row.order_date,
+            user=User.from_orm_fast(row.user) if row.user else None,
+            product=Product.from_orm_fast(row.product) if row.product else None
+        )
+
+T = TypeVar("T")
 
-class PaginatedResponse(BaseModel):
-    items: List[dict]
-    total: int
-    page: int
+class PaginatedResponse(BaseModel, Generic[T]):
+    items: List[T]
+    # total/page/pages are None for keyset (after_id) pages
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[dict] = None
 
 # Validation enums for sort parameters
 class ProductSortFields(str, Enum):
@@ -99,12 +177,10 @@ class SortOrder(str, Enum):
     asc = "asc"
     desc = "desc"
 
-class OrderStatus(str, Enum):
-    pending = "pending"
-    confirmed = "confirmed"
-    shipped = "shipped"
-    delivered = "delivered"
-    cancelled = "cancelled"
+# Built once so membership checks are O(1) without rebuilding a list per call
+PRODUCT_SORT_FIELDS = frozenset(ProductSortFields)
+USER_SORT_FIELDS = frozenset(UserSortFields)
+ORDER_SORT_FIELDS = frozenset(OrderSortFields)
 
 # Query parameter validation schemas
 class ProductQueryParams(BaseModel):
@@ -117,19 +193,15 @@ class ProductQueryParams(BaseModel):
     max_price: Optional[float] = Field(None, ge=0, description="Maximum price")
     sort_by: ProductSortFields = Field(ProductSortFields.id, description="Sort field")
     sort_order: SortOrder = Field(SortOrder.asc, description="Sort order (asc or desc only)")
+    after_id: Optional[int] = Field(None, ge=1, description="Keyset cursor: id of the last row already seen")
+    after_value: Optional[str] = Field(None, max_length=255, description="Keyset cursor: sort value of the last row already seen")
     
-    @validator('max_price')
-    def validate_price_range(cls, v, values):
-        if v is not None and 'min_price' in values and values['min_price'] is not None:
-            if v < values['min_price']:
+    @model_validator(mode='after')
+    def validate_price_range(self):
+        if self.min_price is not None and self.max_price is not None:
+            if self.max_price < self.min_price:
                 raise ValueError('max_price must be greater than or equal to min_price')
-        return v
-    
-    @validator('sort_order')
-    def validate_sort_order(cls, v):
-        if v not in [SortOrder.asc, SortOrder.desc]:
-            raise ValueError('sort_order must be either "asc" or "desc"')
-        return v
+        return self
 
 class UserQueryParams(BaseModel):
     page: int = Field(1, ge=1, description="Page number")
@@ -139,12 +211,8 @@ class UserQueryParams(BaseModel):
     country: Optional[str] = Field(None, max_length=100, description="Country")
     sort_by: UserSortFields = Field(UserSortFields.id, description="Sort field")
     sort_order: SortOrder = Field(SortOrder.asc, description="Sort order (asc or desc only)")
-    
-    @validator('sort_order')
-    def validate_sort_order(cls, v):
-        if v not in [SortOrder.asc, SortOrder.desc]:
-            raise ValueError('sort_order must be either "asc" or "desc"')
-        return v
+    after_id: Optional[int] = Field(None, ge=1, description="Keyset cursor: id of the last row already seen")
+    after_value: Optional[str] = Field(None, max_length=255, description="Keyset cursor: sort value of the last row already seen")
 
 class OrderQueryParams(BaseModel):
     page: int = Field(1, ge=1, description="Page number")
@@ -153,9 +221,54 @@ class OrderQueryParams(BaseModel):
     status: Optional[OrderStatus] = Field(None, description="Order status")
     sort_by: OrderSortFields = Field(OrderSortFields.id, description="Sort field")
     sort_order: SortOrder = Field(SortOrder.asc, description="Sort order (asc or desc only)")
+    after_id: Optional[int] = Field(None, ge=1, description="Keyset cursor: id of the last row already seen")
+    after_value: Optional[str] = Field(None, max_length=255, description="Keyset cursor: sort value of the last row already seen")
+
+# Built once at import so each request only runs the compiled validator
+PRODUCT_QP_ADAPTER = TypeAdapter(ProductQueryParams)
+USER_QP_ADAPTER = TypeAdapter(UserQueryParams)
+ORDER_QP_ADAPTER = TypeAdapter(OrderQueryParams)
+
+# Serializers for responses built from trusted rows: pydantic-core writes the
+# JSON bytes directly, with no intermediate Python dicts
+PRODUCT_ADAPTER = TypeAdapter(Product)
+USER_ADAPTER = TypeAdapter(User)
+ORDER_ADAPTER = TypeAdapter(Order)
+ORDER_PAGE_ADAPTER = TypeAdapter(PaginatedResponse[Order])
+
+def parse_product_qp(raw: dict) -> ProductQueryParams:
+    return PRODUCT_QP_ADAPTER.validate_python(raw)
+
+def parse_user_qp(raw: dict) -> UserQueryParams:
+    return USER_QP_ADAPTER.validate_python(raw)
+
+def parse_order_qp(raw: dict) -> OrderQueryParams:
+    return ORDER_QP_ADAPTER.validate_python(raw)
+
+def query_params_openapi(model: type[BaseModel]) -> dict:
+    """
+    OpenAPI ``parameters`` for a query-param model, for routes that parse the
+    query string themselves and so no longer expose the fields to FastAPI.
+    """
+    schema = model.model_json_schema()
+    defs = schema.get("$defs", {})
+    
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {k: resolve(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [resolve(v) for v in node]
+        return node
     
-    @validator('sort_order')
-    def validate_sort_order(cls, v):
-        if v not in [SortOrder.asc, SortOrder.desc]:
-            raise ValueError('sort_order must be either "asc" or "desc"')
-        return v
\ No newline at end of file
+    return {"parameters": [
+        {
+            "name": name,
+            "in": "query",
+            "required": False,
+            "description": prop.get("description", ""),
+            "schema": resolve(prop)
+        }
+        for name, prop in schema["properties"].items()
+    ]}
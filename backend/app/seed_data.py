@@ -1,112 +1,292 @@
 from faker import Faker
+from sqlalchemy import func, text
 from sqlalchemy.orm import Session
-from models import Product, User,Order
+from psycopg2.extras import execute_values
+from models import Product, User,Order, ORDER_STATUSES
+from database import SessionLocal, SEED_WORKERS
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import multiprocessing
+import os
+import sys
 import random
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime
 
-fake = Faker()
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    # The server runs at log_level=warning, so seed progress gets its own handler
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(processName)s %(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
 
-def seed_products(db: Session, count: int = 50000):
+# A fixed seed, a fixed reference time and explicit id blocks make every
+# /seed-data run into empty tables (e.g. after /truncate-all) produce the same rows
+# for a given SEED_WORKERS, which decides how rows are split between RNG streams
+SEED = int(os.getenv("SEED_RANDOM_SEED", "42"))
+# Seeded timestamps count back from here instead of from now
+SEED_REFERENCE_TIME = datetime.fromisoformat(os.getenv("SEED_REFERENCE_TIME", "2025-01-01T00:00:00"))
+
+# One locale and only the providers the pools use keeps Faker's dispatch short
+fake = Faker('en_US', providers=[
+    'faker.providers.address',
+    'faker.providers.company',
+    'faker.providers.lorem',
+    'faker.providers.person',
+    'faker.providers.phone_number',
+])
+rng = np.random.default_rng(SEED)
+
+def reseed(seed: int):
+    global rng
+    rng = np.random.default_rng(seed)
+    random.seed(seed)
+    Faker.seed(seed)
+
+# Rows per multi-row INSERT page and per commit
+BATCH_SIZE = 10000
+
+# Faker is slow per call, so draw text from pools generated once per seed run
+NAME_POOL_SIZE = 2000
+TEXT_POOL_SIZE = 1000
+
+PRODUCT_COLUMNS = ('id', 'name', 'description', 'price', 'category', 'brand', 'stock_quantity', 'rating', 'is_active', 'created_at', 'updated_at')
+USER_COLUMNS = ('id', 'email', 'first_name', 'last_name', 'phone', 'address', 'city', 'country', 'is_active', 'created_at', 'updated_at')
+ORDER_COLUMNS = ('id', 'user_id', 'product_id', 'quantity', 'unit_price', 'total_amount', 'status', 'order_date')
+
+def make_pool(generator, size: int = NAME_POOL_SIZE) -> list:
+    return [generator() for _ in range(size)]
+
+def random_datetimes(count: int, days: int) -> list:
+    """``count`` naive UTC datetimes spread uniformly over the ``days`` days before SEED_REFERENCE_TIME"""
+    end = np.datetime64(SEED_REFERENCE_TIME, 's')
+    offsets = rng.integers(0, days * 86400, count).astype('timedelta64[s]')
+    return (end - offsets).astype('datetime64[us]').tolist()
+
+def insert_rows(db: Session, model, columns: tuple, rows: list, label: str):
+    """
+    Insert tuples (in ``columns`` order) with psycopg2's execute_values, which sends
+    one multi-row INSERT per page instead of a statement per row. It runs on the
+    session's own connection, so db.commit() covers it.
+    """
+    sql = f"INSERT INTO {model.__tablename__} ({', '.join(columns)}) VALUES %s"
+    for start in range(0, len(rows), BATCH_SIZE):
+        # commit() releases the connection, so take a fresh cursor for every batch
+        with db.connection().connection.cursor() as cursor:
+            execute_values(cursor, sql, rows[start:start + BATCH_SIZE], page_size=BATCH_SIZE)
+        db.commit()
+        logger.info("Seeded %d %s...", min(start + BATCH_SIZE, len(rows)), label)
+
+def seed_products(db: Session, count: int = 50000, first_id: int = None):
     categories = ['Electronics', 'Clothing', 'Home & Garden', 'Sports', 'Books', 'Toys', 'Health', 'Automotive']
     brands = ['Apple', 'Samsung', 'Nike', 'Adidas', 'Sony', 'LG', 'Dell', 'HP', 'Canon', 'Microsoft']
     
-    products = []
-    for i in range(count):
-        product = Product(
-            name=fake.catch_phrase(),
-            description=fake.text(max_nb_chars=500),
-            price=round(random.uniform(10.0, 2000.0), 2),
-            category=random.choice(categories),
-            brand=random.choice(brands),
-            stock_quantity=random.randint(0, 1000),
-            rating=round(random.uniform(1.0, 5.0), 1),
-            is_active=random.choice([True, True, True, False]),  # 75% active
-            created_at=fake.date_time_between(start_date='-2y', end_date='now')
-        )
-        products.append(product)
-        
-        if len(products) >= 1000:  # Batch insert
-            db.bulk_save_objects(products)
-            db.commit()
-            products = []
-            print(f"Seeded {i+1} products...")
+    names = random.choices(make_pool(fake.catch_phrase), k=count)
+    descriptions = random.choices(
+        make_pool(lambda: fake.text(max_nb_chars=500), TEXT_POOL_SIZE), k=count
+    )
     
-    if products:
-        db.bulk_save_objects(products)
-        db.commit()
+    # Numeric columns are drawn as whole arrays; tolist() hands the driver plain Python values
+    # Prices are drawn as integer cents so no float rounding is needed
+    prices = (rng.integers(1000, 200001, count) / 100).tolist()
+    category_values = np.array(categories)[rng.integers(0, len(categories), count)].tolist()
+    brand_values = np.array(brands)[rng.integers(0, len(brands), count)].tolist()
+    stocks = rng.integers(0, 1001, count).tolist()
+    ratings = (rng.integers(10, 51, count) / 10).tolist()
+    active = (rng.random(count) < 0.75).tolist()  # 75% active
+    created = random_datetimes(count, 730)
+    # Raw INSERTs bypass the ORM column defaults, so set updated_at here
+    updated = [SEED_REFERENCE_TIME] * count
+    if first_id is None:
+        first_id = reserve_ids(db, Product, count)
     
-    print(f"Finished seeding {count} products")
-
-def seed_users(db: Session, count: int = 25000):
-    users = []
-    for i in range(count):
-        user = User(
-            email=fake.unique.email(),
-            first_name=fake.first_name(),
-            last_name=fake.last_name(),
-            phone=fake.phone_number(),
-            address=fake.address(),
-            city=fake.city(),
-            country=fake.country(),
-            is_active=random.choice([True, True, True, False]),
-            created_at=fake.date_time_between(start_date='-2y', end_date='now')
-        )
-        users.append(user)
-        
-        if len(users) >= 1000:
-            db.bulk_save_objects(users)
-            db.commit()
-            users = []
-            print(f"Seeded {i+1} users...")
+    products = list(zip(
+        range(first_id, first_id + count), names, descriptions, prices, category_values, brand_values,
+        stocks, ratings, active, created, updated
+    ))
+    insert_rows(db, Product, PRODUCT_COLUMNS, products, "products")
     
-    if users:
-        db.bulk_save_objects(users)
-        db.commit()
+    logger.info("Finished seeding %d products", count)
+
+def seed_users(db: Session, count: int = 25000, first_id: int = None):
+    first_names = random.choices(make_pool(fake.first_name), k=count)
+    last_names = random.choices(make_pool(fake.last_name), k=count)
+    phones = random.choices(make_pool(fake.phone_number), k=count)
+    addresses = random.choices(make_pool(fake.address, TEXT_POOL_SIZE), k=count)
+    cities = random.choices(make_pool(fake.city), k=count)
+    countries = random.choices(make_pool(fake.country), k=count)
+    active = (rng.random(count) < 0.75).tolist()
+    if first_id is None:
+        first_id = reserve_ids(db, User, count)
+    ids = range(first_id, first_id + count)
+    # Ids are never reissued, so suffixing them keeps emails unique without
+    # Faker's retrying unique proxy, even after users are deleted
+    emails = [
+        f"{first.lower()}.{last.lower()}.{i}@example.com"
+        for i, first, last in zip(ids, first_names, last_names)
+    ]
+    created = random_datetimes(count, 730)
+    updated = [SEED_REFERENCE_TIME] * count
+    
+    users = list(zip(
+        ids, emails, first_names, last_names, phones, addresses,
+        cities, countries, active, created, updated
+    ))
+    insert_rows(db, User, USER_COLUMNS, users, "users")
     
-    print(f"Finished seeding {count} users")
+    logger.info("Finished seeding %d users", count)
 
-def seed_orders(db: Session, count: int = 100000):
-    # Get existing user and product IDs
-    user_ids = [row[0] for row in db.query(User.id).all()]
-    product_ids = [row[0] for row in db.query(Product.id).all()]
+def reserve_ids(db: Session, model, count: int) -> int:
+    """
+    Claim ``count`` consecutive ids from the table's sequence and return the first.
+    Seed workers insert explicit ids from the block, so which row gets which id
+    doesn't depend on how their INSERTs interleave, and later inserts start after it.
+    The sequence never moves back (short of TRUNCATE ... RESTART IDENTITY), so a
+    block is never reissued, even after its rows are deleted.
+    """
+    sequence = f"pg_get_serial_sequence('{model.__tablename__}', 'id')"
+    first_id = db.execute(
+        text(f"SELECT setval({sequence}, coalesce(pg_sequence_last_value({sequence}), 0) + :count) - :count + 1"),
+        {"count": count}
+    ).scalar()
+    db.commit()
+    return first_id
+
+def id_range(db: Session, model) -> tuple:
+    """(min id, max id, row count) in one query"""
+    return db.query(func.min(model.id), func.max(model.id), func.count(model.id)).one()
+
+def sample_ids(db: Session, model, bounds: tuple, count: int) -> np.ndarray:
+    low, high, total = bounds
+    if high - low + 1 == total:
+        # Dense ids (the normal case right after seeding): sample the range directly
+        return rng.integers(low, high + 1, count)
+    ids = np.fromiter((row[0] for row in db.query(model.id).order_by(model.id)), dtype=np.int64, count=total)
+    return rng.choice(ids, count)
+
+def seed_orders(db: Session, count: int = 100000, first_id: int = None, id_ranges: tuple = None):
+    user_id_range, product_id_range = id_ranges or (id_range(db, User), id_range(db, Product))
     
-    if not user_ids or not product_ids:
-        print("No users or products found. Please seed users and products first.")
+    if not user_id_range[2] or not product_id_range[2]:
+        logger.warning("No users or products found. Please seed users and products first.")
         return
     
-    statuses = ['pending', 'processing', 'shipped', 'delivered', 'cancelled']
-    orders = []
-    
-    for i in range(count):
-        quantity = random.randint(1, 5)
-        unit_price = round(random.uniform(10.0, 500.0), 2)
-        
-        order = Order(
-            user_id=random.choice(user_ids),
-            product_id=random.choice(product_ids),
-            quantity=quantity,
-            unit_price=unit_price,
-            total_amount=round(quantity * unit_price, 2),
-            status=random.choice(statuses),
-            order_date=fake.date_time_between(start_date='-1y', end_date='now')
-        )
-        orders.append(order)
-        
-        if len(orders) >= 1000:
-            db.bulk_save_objects(orders)
-            db.commit()
-            orders = []
-            print(f"Seeded {i+1} orders...")
+    order_user_ids = sample_ids(db, User, user_id_range, count).tolist()
+    order_product_ids = sample_ids(db, Product, product_id_range, count).tolist()
+    quantities = rng.integers(1, 6, count)
+    unit_cents = rng.integers(1000, 50001, count)
+    # Totals stay exact in integer cents and are converted once
+    totals = (quantities * unit_cents / 100).tolist()
+    status_values = np.array(ORDER_STATUSES)[rng.integers(0, len(ORDER_STATUSES), count)].tolist()
+    order_dates = random_datetimes(count, 365)
+    if first_id is None:
+        first_id = reserve_ids(db, Order, count)
     
-    if orders:
-        db.bulk_save_objects(orders)
-        db.commit()
+    orders = list(zip(
+        range(first_id, first_id + count), order_user_ids, order_product_ids, quantities.tolist(), (unit_cents / 100).tolist(),
+        totals, status_values, order_dates
+    ))
+    insert_rows(db, Order, ORDER_COLUMNS, orders, "orders")
     
-    print(f"Finished seeding {count} orders")
+    logger.info("Finished seeding %d orders", count)
+
+def secondary_indexes() -> list:
+    # Unique indexes stay in place so duplicate emails are still rejected
+    return [
+        index
+        for table in (Product.__table__, User.__table__, Order.__table__)
+        for index in table.indexes
+        if not index.unique
+    ]
+
+def foreign_keys() -> list:
+    """(constraint name, ADD CONSTRAINT body) for each FK, using Postgres' default names"""
+    return [
+        (
+            f"{fk.table.name}_{fk.column_keys[0]}_fkey",
+            f"FOREIGN KEY ({fk.column_keys[0]}) REFERENCES {fk.referred_table.name} ({fk.elements[0].column.name})"
+        )
+        for fk in Order.__table__.foreign_key_constraints
+    ]
+
+def drop_indexes_and_keys(db: Session):
+    """Bulk loads run much faster without per-row index maintenance and FK checks"""
+    for name, _ in foreign_keys():
+        db.execute(text(f"ALTER TABLE orders DROP CONSTRAINT IF EXISTS {name}"))
+    for index in secondary_indexes():
+        index.drop(bind=db.connection(), checkfirst=True)
+    db.commit()
+
+def restore_indexes_and_keys(db: Session):
+    for index in secondary_indexes():
+        index.create(bind=db.connection(), checkfirst=True)
+    for name, definition in foreign_keys():
+        # NOT VALID + VALIDATE checks existing rows without blocking writes for the whole scan
+        db.execute(text(f"ALTER TABLE orders ADD CONSTRAINT {name} {definition} NOT VALID"))
+        db.execute(text(f"ALTER TABLE orders VALIDATE CONSTRAINT {name}"))
+    db.commit()
+    for table in ("products", "users", "orders"):
+        db.execute(text(f"ANALYZE {table}"))
+    db.commit()
+
+# Seeding is called from a server threadpool thread, and forking a multi-threaded
+# process can copy locks held by other threads. A forkserver is started with a
+# clean exec instead; preloading this module lets each worker fork from it ready to run.
+SEED_CONTEXT = multiprocessing.get_context("forkserver")
+SEED_CONTEXT.set_forkserver_preload([__name__])
+
+def split_count(count: int, parts: int) -> list:
+    """Split count into at most ``parts`` near-equal non-empty chunks"""
+    parts = max(1, min(parts, count))
+    return [count // parts + (1 if i < count % parts else 0) for i in range(parts)]
+
+def _seed_worker(seed_fn, count: int, seed: int, *args) -> int:
+    """Runs in a fresh seed process with its own engine; only the RNG needs seeding"""
+    reseed(seed)
+    with SessionLocal() as db:
+        seed_fn(db, count, *args)
+    return count
+
+def seed_parallel(seed_fn, count: int, args_for_chunk=None) -> int:
+    """
+    Seed ``count`` rows with ``seed_fn`` split across SEED_WORKERS processes. Rows
+    are generated independently, so workers share nothing but small arguments
+    from ``args_for_chunk(offset, size)``.
+    """
+    chunks = split_count(count, SEED_WORKERS)
+    offsets = [sum(chunks[:i]) for i in range(len(chunks))]
+    # Distinct per-worker seeds drawn from the seeded parent keep runs reproducible
+    seeds = rng.integers(0, 2**32, len(chunks)).tolist()
+    with ProcessPoolExecutor(max_workers=len(chunks), mp_context=SEED_CONTEXT) as pool:
+        futures = [
+            pool.submit(_seed_worker, seed_fn, size, seed, *(args_for_chunk(offset, size) if args_for_chunk else ()))
+            for offset, size, seed in zip(offsets, chunks, seeds)
+        ]
+        return sum(future.result() for future in futures)
 
 def seed_all_data(db: Session):
-    print("Starting data seeding...")
-    seed_products(db, 50000)
-    seed_users(db, 25000)
-    seed_orders(db, 100000)
-    print("Data seeding completed!")
\ No newline at end of file
+    logger.info("Starting data seeding...")
+    reseed(SEED)
+    drop_indexes_and_keys(db)
+    try:
+        first_product_id = reserve_ids(db, Product, 50000)
+        seed_parallel(seed_products, 50000, lambda offset, size: (first_product_id + offset,))
+        first_user_id = reserve_ids(db, User, 25000)
+        seed_parallel(seed_users, 25000, lambda offset, size: (first_user_id + offset,))
+        id_ranges = (id_range(db, User), id_range(db, Product))
+        first_order_id = reserve_ids(db, Order, 100000)
+        seed_parallel(seed_orders, 100000, lambda offset, size: (first_order_id + offset, id_ranges))
+    except Exception:
+        # Still rebuild after a failed load, but never let that hide why the load failed
+        db.rollback()
+        try:
+            restore_indexes_and_keys(db)
+        except Exception:
+            db.rollback()
+            logger.exception("Rebuilding indexes and foreign keys failed; rerun the seed to restore them")
+        raise
+    logger.info("Rebuilding indexes and foreign keys...")
+    restore_indexes_and_keys(db)
+    logger.info("Data seeding completed!")
\ No newline at end of file
@@ -101,12 +101,12 @@ export function DataTable() {
         setAllData(response.items)
       }
       
-      setPagination({
-        page: response.page,
+      setPagination(prev => ({
+        page: response.page ?? prev.page,
         size: response.size,
-        total: response.total,
-        pages: response.pages
-      })
+        total: response.total ?? prev.total,
+        pages: response.pages ?? prev.pages
+      }))
     } catch (err) {
       setError(err instanceof Error ? err.message : 'An error occurred')
       setData([])
@@ -94,7 +94,7 @@ export function VirtualizedTable({
       case 'status':
         const statusColors = {
           pending: 'bg-yellow-100 text-yellow-800',
-          processing: 'bg-blue-100 text-blue-800',
+          confirmed: 'bg-blue-100 text-blue-800',
           shipped: 'bg-purple-100 text-purple-800',
           delivered: 'bg-green-100 text-green-800',
           cancelled: 'bg-red-100 text-red-800'
@@ -1,7 +1,7 @@
 export interface Product {
   id: number;
   name: string;
-  description: string;
+  description?: string;
   price: number;
   category: string;
   brand: string;
@@ -50,10 +50,13 @@ export interface Order {
 
 export interface PaginatedResponse<T> {
   items: T[];
-  total: number;
-  page: number;
+  // null on keyset (after_id) pages, which skip the count
+  total: number | null;
+  page: number | null;
   size: number;
-  pages: number;
+  pages: number | null;
+  // after_value is null when the last row's sort value is; omit it on the next request
+  next_cursor?: { after_id: number; after_value: string | number | null } | null;
 }
 
 export interface FilterParams {